@@ -1,5 +1,7 @@
 import re
-from collections import Counter
+
+# Tokenize the text into words; a greedy \w+ always spans a whole word, so no \b assertions are needed
+_TOKEN_RE = re.compile(r'\w+')
 
 def rate_text(plavra, text):
     """
@@ -8,24 +10,21 @@ def rate_text(plavra, text):
     The rating is normalized by dividing it by the maximum possible cumulative frequency of words in plavra, and then scaled between 0 and 5.
 
     Parameters:
-    plavra (list): A list of words or phrases to rate the input text.
+    plavra (list or set): The words to rate the input text, in any case. Only entries that are a single word are counted, so a phrase never matches.
     text (str): The input text to be rated.
 
     Returns:
     float: The rating score between 0 and 5, where 0 indicates no relevance and 5 indicates maximum relevance.
     """
 
-    # Convert the text to lowercase
-    text = text.lower()
-
-    # Tokenize the text by splitting it into words using regex
-    words = re.findall(r'\b\w+\b', text)
+    # Build the set of lowercased plavra words
+    plavra_set = frozenset(map(str.lower, plavra))
 
-    # Count the occurrences of words in the text
-    word_count = Counter(words)
+    # Tokenize the lowercased text into words
+    words = _TOKEN_RE.findall(text.lower())
 
     # Calculate the cumulative frequency of words in plavra within the text
-    cumulative_frequency = sum(word_count[word.lower()] for word in plavra)
+    cumulative_frequency = sum(1 for word in words if word in plavra_set)
 
     # Calculate the maximum possible cumulative frequency of words in plavra
     max_cumulative_frequency = len(words)
@@ -36,9 +35,4 @@ def rate_text(plavra, text):
     # Scale the rating to be between 0 and 5
     scaled_rating = normalized_rating * 5
 
-    # Print the scaled rating score
-    print(scaled_rating)
-
     return scaled_rating
-
-
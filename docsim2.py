@@ -1,5 +1,5 @@
 """
-This module provides a function to calculate a rating score for a given text based on the occurrence of words or phrases
+This module provides a function to calculate a rating score for a given text based on the occurrence of words
 in a list using Term Frequency (TF). The rating is normalized by dividing it by the maximum possible term frequency for
 the words in the list within the text and then scaled between 0 and 5.
 
@@ -9,46 +9,72 @@ Project Owner: Monica Piccinini (monicapiccinini12@gmail.com)
 
 
 
-from sklearn.feature_extraction.text import CountVectorizer
+import logging
+import re
+from functools import lru_cache
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+logger = logging.getLogger(__name__)
+
+# A plavra entry is only counted when it is a single token, as in rate_texts_batch and docsim.rate_text
+_WORD_RE = re.compile(r"\w+")
+
+# Stateless vectorizer shared by every call, so no vocabulary has to be fitted per text
+_HV = HashingVectorizer(n_features=2**18, alternate_sign=False, lowercase=True, token_pattern=r"\w+", norm=None)
 
 def rate_text(plavra, text):
     """
-    Calculate a rating score for a given text based on the occurrence of words or phrases in plavra using cumulative frequency.
+    Calculate a rating score for a given text based on the occurrence of words in plavra using cumulative frequency.
 
     The rating is normalized by dividing it by the total frequency of words in the text, and then scaled between 0 and 5.
 
     Parameters:
-    plavra (list): A list of words or phrases to rate the input text.
+    plavra (list): A list of words to rate the input text. Only entries that are a single word are counted, so a phrase never matches.
     text (str): The input text to be rated.
 
     Returns:
     float: The rating score between 0 and 5, where 0 indicates no relevance and 5 indicates maximum relevance.
     """
-    
-    # Create a CountVectorizer object
-    vectorizer = CountVectorizer()
 
-    # Fit and transform the list of words and phrases and the description string into term frequency matrices
-    X = vectorizer.fit_transform(plavra + [text])
+    # The same description is often rated more than once, so look it up in the cache first
+    return _rate_text_cached(tuple(sorted(map(str.lower, plavra))), text)
+
+
+@lru_cache(maxsize=128)
+def _plavra_columns(plavra):
+    """
+    Return the hashed feature columns of the single-word entries of plavra, given as a tuple so it can be cached.
+    """
+
+    # Hashing a phrase would match each of its words on its own, so leave phrases out
+    words = [word for word in plavra if _WORD_RE.fullmatch(word)]
+
+    if not words:
+        return np.empty(0, dtype=np.intp)
+
+    return _HV.transform(words).sum(axis=0).nonzero()[1]
 
-    # Get the feature names (words or phrases) from the vectorizer
-    features = vectorizer.get_feature_names_out()
 
-    # Get the term frequency matrix for the description string (the last row of X)
-    desc_tf = X[-1]
+@lru_cache(maxsize=4096)
+def _rate_text_cached(plavra, text):
+    """
+    Cached implementation of rate_text, with plavra given as a sorted tuple of lowercased words so it can be hashed.
+    """
+
+    # Without any plavra there is nothing to rate, and hashing an empty plavra fails
+    if not plavra:
+        return 0.0
 
-    # Initialize a variable to store the rating score
-    rating = 0
+    # Hash the description string into a term frequency row, without building a vocabulary
+    desc_tf = _HV.transform([text])
 
-    # Loop over the list of words and phrases
-    for i, word in enumerate(plavra):
-        # Get the term frequency for the word or phrase in the description string
-        score = desc_tf[0, i]
-        # Add the score to the rating
-        rating += score
+    # Sum the term frequencies of the words in plavra, looking only at the words present in the text
+    rating = desc_tf.data[np.isin(desc_tf.indices, _plavra_columns(plavra))].sum()
 
     # Calculate the total frequency of words in the text
-    total_frequency = sum(desc_tf[0, i] for i in range(len(features)))
+    total_frequency = desc_tf.data.sum()
 
     # Normalize the rating by dividing it by the total frequency of words in the text
     normalized_rating = rating / total_frequency if total_frequency != 0 else 0
@@ -56,9 +82,43 @@ def rate_text(plavra, text):
     # Scale the rating to be between 0 and 5
     scaled_rating = normalized_rating * 5
 
-    # Print the scaled rating score
-    print(scaled_rating)
+    logger.debug("rating=%s", scaled_rating)
+
+    return float(scaled_rating)
+
+
+def rate_texts_batch(plavra, texts):
+    """
+    Calculate rating scores for a list of texts in a single vectorized pass.
+
+    Each text is rated as the share of its words that appear in plavra, scaled between 0 and 5. The plavra words are
+    lowercased once and passed as a fixed vocabulary, so no vocabulary is built per text.
+
+    Parameters:
+    plavra (list or set): The words to rate the input texts, in any case. Only entries that are a single word are counted, so a phrase never matches.
+    texts (list): The input texts to be rated.
+
+    Returns:
+    list: The rating scores between 0 and 5, one per text, in the same order as texts.
+    """
+
+    if not texts:
+        return []
+
+    # Lowercase the plavra once, dropping duplicates while keeping their order
+    plavra_lower = list(dict.fromkeys(word.lower() for word in plavra))
+
+    if not plavra_lower:
+        return [0.0] * len(texts)
+
+    # Count the occurrences of the plavra words in every text at once
+    vectorizer = CountVectorizer(vocabulary=plavra_lower, lowercase=True, token_pattern=r"\w+")
+    hits = np.asarray(vectorizer.transform(texts).sum(axis=1)).ravel()
 
-    return scaled_rating
+    # Count the total number of words in every text
+    total_counts = np.asarray(_HV.transform(texts).sum(axis=1)).ravel()
 
+    # Normalize by the total number of words and scale the ratings to be between 0 and 5
+    ratings = np.divide(hits, total_counts, out=np.zeros(len(texts)), where=total_counts != 0) * 5
 
+    return ratings.tolist()
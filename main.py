@@ -1,17 +1,23 @@
 """
-This API module is designed to fetch, process, and rate job postings from LinkedIn. It uses FastAPI to provide an endpoint for getting jobs with specific titles, keywords, and location parameters. The API also utilizes the `rate_text` function from the `docsim.py` module to rate job postings based on the relevance of their descriptions to the provided keywords.
+This API module is designed to fetch, process, and rate job postings from LinkedIn. It uses FastAPI to provide an endpoint for getting jobs with specific titles, keywords, and location parameters. The API also utilizes the `rate_texts_batch` function from the `docsim2.py` module to rate job postings based on the relevance of their descriptions to the provided keywords.
 
 Developer: Irfan Ahmad (devirfan.mlka@gmail.com / https://irfan-ahmad.com)
 Project Owner: Monica Piccinini (monicapiccinini12@gmail.com)
 
 The module contains the following functions:
     - get_job_info: Extracts relevant information from a job card.
+    - create_client: Creates the HTTP client used for the LinkedIn requests.
+    - lifespan: Creates the HTTP client and rate limiter shared by the requests of the app.
+    - RateLimiter: Bounds and spaces out the requests to LinkedIn made from one event loop.
+    - fetch_page: Fetches a LinkedIn page within the rate limit, retrying on 429 and 5xx gateway responses.
     - get_job_cards: Fetches job cards from a LinkedIn URL.
-    - extractJobs: Fetches job listings from LinkedIn based on the provided URLs and keywords.
+    - extract_jobs_async: Fetches job listings from LinkedIn based on the provided URLs and keywords.
+    - extractJobs: Synchronous wrapper around extract_jobs_async.
     - extractDescription: Extracts job description and location from a LinkedIn job posting URL.
-    - rate_job: Rates a job based on its description and a list of keywords (plavras).
+    - rate_jobs: Rates jobs based on their descriptions and a list of keywords (plavras).
     - search_customer: Searches for a customer by ID and returns relevant customer information.
     - create_time_param: Converts a time period string into a LinkedIn time parameter.
+    - create_search_urls: Builds a LinkedIn job search URL for each job title.
 
 The module also defines the following FastAPI endpoints:
     - /jobs: Accepts a POST request with job titles, keywords, time period, and location, and returns the relevant job listings.
@@ -21,18 +27,22 @@ The module also defines the following FastAPI endpoints:
 
 
 # Import necessary libraries
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from pydantic import BaseModel
-from typing import Optional, List
-from concurrent.futures import ThreadPoolExecutor
-from docsim import rate_text
-from itertools import repeat
-import requests
-import json
+from typing import Optional, List, Tuple
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from docsim2 import rate_texts_batch
+from urllib.parse import quote, urlencode, urlsplit
+import asyncio
+import diskcache
+import httpx
+import logging
+import orjson
 import re
-import time
-import random
 import sys
+import time
 
 
 
@@ -64,7 +74,19 @@ origins = [
 
 #from new_sendemail import send_email
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  """
+    Creates the HTTP client and rate limiter shared by all the requests of the app, so connections are reused across requests, and closes the client on shutdown.
+  """
+
+  async with create_client() as client:
+    app.state.client = client
+    app.state.limiter = RateLimiter()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -84,43 +106,186 @@ url2 = 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?k
 
 LOCATION = 'Brazil'
 
+logger = logging.getLogger(__name__)
+
+# LinkedIn time parameters for each time period a user can pick
+_TIME_PARAMS = {
+    "past 24 hours": "&f_TPR=r86400",
+    "past week": "&f_TPR=r604800",
+    "past month": "&f_TPR=r2592000",
+    "any time": "",
+}
+
+# Maximum number of requests in flight to LinkedIn at once
+MAX_CONCURRENT_REQUESTS = 8
+
+# Minimum delay in seconds between two requests to LinkedIn from one worker process; each of the Procfile's workers has its own limit
+REQUEST_INTERVAL = 0.25
+
+# Number of times a request is retried when LinkedIn answers with one of RETRY_STATUSES or the connection fails
+MAX_RETRIES = 3
+
+# Response statuses worth retrying, and the base delay in seconds of the exponential backoff between retries
+RETRY_STATUSES = {429, 502, 503, 504}
+BACKOFF_FACTOR = 0.3
+
+# Longest wait in seconds between two retries, whatever Retry-After LinkedIn sends
+MAX_BACKOFF = 10
+
+# Headers sent with every request; gzip roughly halves the bytes of LinkedIn's HTML over the wire
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept-Encoding': 'gzip',
+}
+
+# Maximum number of seconds to wait for all the job search pages of a request
+SEARCH_TIMEOUT = 30
+
+# Seconds to wait for all the job descriptions of a request once its search pages are in, plus REQUEST_INTERVAL per description
+DESCRIPTION_TIMEOUT = 60
+
+# Job descriptions already fetched, kept on disk so they are shared across requests and workers
+DESCRIPTION_CACHE = diskcache.Cache("/tmp/linkedin_cache", size_limit=2**30)
+
+# Number of seconds a cached job description is kept
+DESCRIPTION_TTL = 21600
+
+# LinkedIn job posting URLs end their path with the numeric job ID
+JOB_ID_RE = re.compile(r'(\d+)/?$')
+
+
+
+def create_client():
+  """
+    Creates the HTTP client used for the LinkedIn requests.
+    
+    Returns:
+        httpx.AsyncClient: An HTTP/2 client with a bounded connection pool that retries failed connections.
+  """
+
+  transport = httpx.AsyncHTTPTransport(
+      http2=True,
+      retries=MAX_RETRIES,
+      limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+  )
+
+  return httpx.AsyncClient(
+      transport=transport,
+      headers=HEADERS,
+      timeout=10,
+      follow_redirects=True,
+  )
+
+
+class RateLimiter:
+  """
+    Bounds the requests in flight to LinkedIn to MAX_CONCURRENT_REQUESTS and spaces them REQUEST_INTERVAL apart.
+    Its asyncio primitives bind to the event loop that first uses them, so create one per event loop.
+  """
+
+  def __init__(self):
+    self.bucket = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    self.lock = asyncio.Lock()
+    self.next_request_time = 0.0
 
-def get_job_info(card, plavras):
+  async def wait_for_turn(self):
+    """
+      Waits until the rate limit allows another request to LinkedIn.
+    """
+
+    # Reserve the next free slot, then wait for it outside the lock
+    async with self.lock:
+      now = time.monotonic()
+      delay = self.next_request_time - now
+      self.next_request_time = max(now, self.next_request_time) + REQUEST_INTERVAL
+
+    if delay > 0:
+      await asyncio.sleep(delay)
+
+  def pause(self, delay):
+    """
+      Holds back every request to LinkedIn through this limiter for at least delay seconds.
+    """
+
+    self.next_request_time = max(self.next_request_time, time.monotonic() + delay)
+
+
+async def fetch_page(client, limiter, url):
   """
-    Extracts job information from a BeautifulSoup card object and a list of keywords (plavras).
+    Fetches a LinkedIn page within the rate limit, retrying when LinkedIn answers with one of RETRY_STATUSES.
     
     Args:
-        card (bs4.element.Tag): A BeautifulSoup object representing a single job card.
-        plavras (List[str]): A list of keywords to rate the job.
+        client (httpx.AsyncClient): The HTTP client to fetch the page with.
+        limiter (RateLimiter): The rate limiter of the current event loop.
+        url (str): The URL of the page.
     
     Returns:
-        dict: A dictionary containing job title, company name, day posted, job URL, rating, location, and job description.
+        httpx.Response: The response of the first attempt LinkedIn did not ask to retry.
+    
+    Raises:
+        httpx.HTTPStatusError: If LinkedIn still answers with one of RETRY_STATUSES after MAX_RETRIES retries.
+  """
+
+  for attempt in range(MAX_RETRIES + 1):
+    async with limiter.bucket:
+      await limiter.wait_for_turn()
+      res = await client.get(url)
+
+    if res.status_code not in RETRY_STATUSES:
+      return res
+
+    if attempt == MAX_RETRIES:
+      break
+
+    # Back off for as long as LinkedIn asks, or exponentially if it does not say, but never longer than MAX_BACKOFF
+    retry_after = res.headers.get("Retry-After", "")
+    delay = min(int(retry_after) if retry_after.isdigit() else BACKOFF_FACTOR * 2 ** attempt, MAX_BACKOFF)
+    
+    # A 429 means the whole worker is going too fast, so hold back its other requests too; the retry waits in wait_for_turn
+    if res.status_code == 429:
+      limiter.pause(delay)
+    else:
+      await asyncio.sleep(delay)
+
+  # LinkedIn is still refusing the request, so fail instead of returning its error page
+  res.raise_for_status()
+
+
+def get_job_info(card):
+  """
+    Extracts job information from a selectolax card node. The description is fetched and the job is rated later, together with the other jobs.
+    
+    Args:
+        card (selectolax.lexbor.LexborNode): A selectolax node representing a single job card.
+    
+    Returns:
+        dict: A dictionary containing job title, company name, day posted, job URL, and location.
   """
 
   # Get the text content and href attribute of the title link element
-  jobTitle = card.find("h3", class_="base-search-card__title").text.strip()
-  jobURL = card.find("a")['href']
+  jobTitle = card.css_first("h3.base-search-card__title").text().strip()
+  jobURL = card.css_first("a").attributes.get('href')
+  
+  # A link without an href has no description to fetch, nor anything to show
+  if not jobURL:
+    raise ValueError("job card link has no href")
+  
   try:
-    location = card.find("span", class_='job-search-card__location').text.strip()
-  except:
+    location = card.css_first("span.job-search-card__location").text().strip()
+  except AttributeError:
     location = 'location not given'
 
-  jobDesc = extractDescription(jobURL)
-  
   # Get the text content of the company link element
   try:
-    companyName = card.find("h4", class_="base-search-card__subtitle").text.strip()
-  except:
+    companyName = card.css_first("h4.base-search-card__subtitle").text().strip()
+  except AttributeError:
     companyName = 'Not specified'
 
   # Get the text content of the date span element
   try:
-    dayPosted = card.find("time").text.strip()
-  except:
+    dayPosted = card.css_first("time").text().strip()
+  except AttributeError:
     dayPosted = False
-    
-  rating = rate_job(jobDesc['description'], plavras)
-        
 
       # Create a dictionary with all these information and append it to results list 
   return {
@@ -128,162 +293,251 @@ def get_job_info(card, plavras):
           "companyName": companyName,
           "dayPosted": dayPosted,
            "jobURL": jobURL,
-           'rating': rating,
           'location': location,
-          'jobDesc': jobDesc['description']
       }
     
     
-def get_job_cards(url):
+async def get_job_cards(client, limiter, url):
     """
-    Fetches the HTML content from a LinkedIn jobs search URL and returns a list of job cards as BeautifulSoup objects.
+    Fetches the HTML content from a LinkedIn jobs search URL and returns a list of job cards as selectolax nodes.
     
     Args:
+        client (httpx.AsyncClient): The HTTP client to fetch the page with.
+        limiter (RateLimiter): The rate limiter of the current event loop.
         url (str): A LinkedIn job search URL.
     
     Returns:
-        List[bs4.element.Tag]: A list of job cards as BeautifulSoup objects.
+        List[selectolax.lexbor.LexborNode]: A list of job cards as selectolax nodes.
     """
     
     
-    res = requests.get(url)
-    time.sleep(1)
+    res = await fetch_page(client, limiter, url)
+    
+    # A blocked or failed search page has no job cards to parse
+    res.raise_for_status()
     html = res.text    
 
-    # Parse the HTML content using BeautifulSoup library (or any other method)
-    soup = BeautifulSoup(html, "html.parser")
+    # Parse the HTML content using selectolax, which only builds Python objects for the nodes queried
+    tree = LexborHTMLParser(html)
 
     # Find all the elements with class name 'base-card' which contain each job listing
-    cards_ul = soup.find('ul', class_="jobs-search__results-list")
-    
-    cards = []
+    cards_ul = tree.css_first("ul.jobs-search__results-list")
     
-    if cards_ul:
-        cards = cards_ul.find_all('li')
+    if cards_ul is not None:
+        cards = cards_ul.css('li')
     else:
-        try:
-            cards = soup.find_all('li')
-        except:
-            ...
+        cards = tree.css('li')
     
     return cards
 
 
-def extractJobs(urls:list, plavras:list):
+async def extract_jobs_async(client, limiter, urls:list, plavras:list):
   """
     Extracts job information from a list of LinkedIn job search URLs and a list of keywords (plavras).
     
     Args:
+        client (httpx.AsyncClient): The HTTP client to fetch the pages with.
+        limiter (RateLimiter): The rate limiter of the current event loop.
         urls (List[str]): A list of LinkedIn job search URLs.
         plavras (List[str]): A list of keywords to rate the jobs.
     
     Returns:
-        Tuple[List[dict], int]: A tuple containing a list of job dictionaries and the total number of cards.
+        Tuple[List[dict], int]: A tuple containing a list of job dictionaries and the total number of cards. The jobDesc and rating of a job whose description could not be fetched are None.
   """
 
   # Create an empty list to store the results
   results = []
+  total_cards = 0
 
-  # Fetch the HTML content from the URL using requests library (or any other method)
-  try:
-    with ThreadPoolExecutor(max_workers=10) as executor:
-      cards = executor.map(get_job_cards, urls)
-    
-    cards = list(cards)
-    cards = [card for card2 in cards for card in card2]
-    
-    total_cards = len(cards)
-    
-    if len(cards) ==0:
-      return [results, 0]
-    
+  # Jobs of each search page, in the order of urls, so the results keep the same order whichever page arrives first
+  jobs_by_url = [[] for _ in urls]
+  
+  # Description fetches keyed by job URL, as the same job shows up under overlapping titles
+  description_tasks = {}
+  
+  # Start fetching the descriptions of a search page as soon as that page arrives, skipping pages that fail or are too slow
+  page_indexes = {asyncio.create_task(get_job_cards(client, limiter, url)): i for i, url in enumerate(urls)}
+  pending = set(page_indexes)
+  deadline = asyncio.get_running_loop().time() + SEARCH_TIMEOUT
+  
+  while pending:
+    done, pending = await asyncio.wait(pending, timeout=deadline - asyncio.get_running_loop().time(), return_when=asyncio.FIRST_COMPLETED)
     
-
-    # Loop through each card element and extract the relevant information
-    #results = [get_job_info(card, plavras) for card in cards]
-    with ThreadPoolExecutor(max_workers=len(cards)) as executor:
-      job_data = executor.map(get_job_info, cards, repeat(plavras))
+    if not done:
+      logger.warning("Timed out after %s seconds waiting for %s job search pages", SEARCH_TIMEOUT, len(pending))
+      
+      # Free the rate limit for the description fetches of the pages that did arrive
+      for task in pending:
+        task.cancel()
+      break
+    
+    for task in done:
+      try:
+        cards = task.result()
+      except httpx.HTTPError as e:
+        logger.warning("Could not fetch a job search page: %r", e)
+        continue
       
-    job_data_list = list(job_data)
+      total_cards += len(cards)
+      
+      for card in cards:
+        try:
+          job = get_job_info(card)
+        except (AttributeError, KeyError, ValueError) as e:
+          logger.warning("Skipping a malformed job card: %r", e)
+          continue
+        
+        jobs_by_url[page_indexes[task]].append(job)
+        
+        if job['jobURL'] not in description_tasks:
+          description_tasks[job['jobURL']] = asyncio.create_task(extractDescription(client, limiter, job['jobURL']))
+  
+  jobs = [job for page_jobs in jobs_by_url for job in page_jobs]
+  
+  if not jobs:
+    return [results, total_cards]
+  
+  # Wait for the descriptions for a bounded time, which grows with the number of fetches the rate limit has to space out
+  description_timeout = DESCRIPTION_TIMEOUT + len(description_tasks) * REQUEST_INTERVAL
+  _, pending = await asyncio.wait(description_tasks.values(), timeout=description_timeout)
+  
+  if pending:
+    logger.warning("Timed out after %s seconds waiting for %s job descriptions", description_timeout, len(pending))
     
-    for job in job_data_list:
-      results.append(job)
+    for task in pending:
+      task.cancel()
+  
+  # A description that was not fetched is None, so the job is not scored as if it matched no keyword
+  descriptions = {}
+  
+  for jobURL, task in description_tasks.items():
+    if task in pending:
+      descriptions[jobURL] = None
+    elif task.exception() is not None:
+      # Only this job loses its description, e.g. for a job URL httpx cannot request
+      logger.warning("Could not extract the job description at %s: %r", jobURL, task.exception())
+      descriptions[jobURL] = None
+    else:
+      descriptions[jobURL] = task.result().get('description')
+  
+  for job in jobs:
+    job['jobDesc'] = descriptions[job['jobURL']]
   
-  except:
-    ...
+  # Rate all the fetched job descriptions at once, off the event loop; the other jobs have no rating
+  fetched_jobs = [job for job in jobs if job['jobDesc'] is not None]
+  ratings = await asyncio.to_thread(rate_jobs, [job['jobDesc'] for job in fetched_jobs], plavras)
+  
+  for job in jobs:
+    job['rating'] = None
+  
+  for job, rating in zip(fetched_jobs, ratings):
+    job['rating'] = rating
+  
+  results.extend(jobs)
 
   # Return results list 
   return [results, total_cards]
+
+
+def extractJobs(urls:list, plavras:list):
+  """
+    Synchronous wrapper around extract_jobs_async, for callers outside an event loop.
+    
+    Args:
+        urls (List[str]): A list of LinkedIn job search URLs.
+        plavras (List[str]): A list of keywords to rate the jobs.
+    
+    Returns:
+        Tuple[List[dict], int]: A tuple containing a list of job dictionaries and the total number of cards.
+  """
+
+  async def run():
+    async with create_client() as client:
+      return await extract_jobs_async(client, RateLimiter(), urls, plavras)
+
+  return asyncio.run(run())
   
-def extractDescription(url):
+async def extractDescription(client, limiter, url):
   """
     Extracts job description and location from a LinkedIn job posting URL.
     
     Args:
+        client (httpx.AsyncClient): The HTTP client to fetch the page with.
+        limiter (RateLimiter): The rate limiter of the current event loop.
         url (str): A LinkedIn job posting URL.
     
     Returns:
         dict: A dictionary containing the job description and location.
   """
 
+  # The same job is linked with different subdomains and tracking parameters, so key the cache by its ID
+  url_path = urlsplit(url).path
+  job_id = JOB_ID_RE.search(url_path)
+  cache_key = job_id.group(1) if job_id else url_path
+  
+  # The disk cache is backed by SQLite, so keep its reads and writes off the event loop
+  cached = await asyncio.to_thread(DESCRIPTION_CACHE.get, cache_key)
+  if cached is not None:
+    return cached
+
   # Create an empty dictionary to store the result
   result = {}
 
-  # Fetch the HTML content from the URL using requests library (or any other method)
+  # Fetch the HTML content from the URL
   try:
-    time.sleep(random.uniform(0.5, 3))
-    res = requests.get(url)
-    time.sleep(random.uniform(0.5, 3))
+    res = await fetch_page(client, limiter, url)
+    
+    # Do not parse, or cache, the error page of a blocked or failed request
+    res.raise_for_status()
     html = res.text
 
-    # Parse the HTML content using BeautifulSoup library (or any other method)
-    soup = BeautifulSoup(html, "html.parser")
+    # Parse the HTML content using selectolax, which only builds Python objects for the nodes queried
+    tree = LexborHTMLParser(html)
     
-    # Find the element with class name 'description__text' which contains the job's description
-    descriptionDiv = soup.find("div", class_="show-more-less-html__markup")
+    # Find the element with class name 'show-more-less-html__markup' which contains the job's description
+    descriptionDiv = tree.css_first("div.show-more-less-html__markup")
       
-    # Call the parseDescription function on this element and get the result dictionary
-    
-    time.sleep(0.5)
     # Get the text content of the element
     if descriptionDiv is not None:
-      description = descriptionDiv.text.strip()
+      description = descriptionDiv.text().strip()
     else:
       description = 'no description specified'
       
 
     # Add the complete description to result dictionary 
     result["description"] = description
+    
+    # Only cache real descriptions, so a page LinkedIn served without one is fetched again next time
+    if descriptionDiv is not None:
+      await asyncio.to_thread(DESCRIPTION_CACHE.set, cache_key, result, expire=DESCRIPTION_TTL)
 
-  except:
-    ...
+  except httpx.HTTPError as e:
+    logger.warning("Could not fetch the job description at %s: %r", url, e)
 
 
   # Return result dictionary 
   return result
 
    
-def rate_job(job_description, plavras=False):
+def rate_jobs(job_descriptions, plavras=False):
     """
-    Rates a job based on its description and a list of keywords (plavras).
+    Rates jobs based on their descriptions and a list of keywords (plavras).
     
     Args:
-        job_description (str): The job description as a string.
-        plavras (List[str], optional): A list of keywords to rate the job. Defaults to False.
+        job_descriptions (List[str]): The job descriptions as strings.
+        plavras (List[str], optional): A list of keywords to rate the jobs. Defaults to False.
     
     Returns:
-        float: The rating score, rounded to 2 decimal places.
+        List[int]: The rating scores, rounded, one per job description.
     """
     
-    rating = 0
-
     # Check if there are any plavras for the user
     if not plavras:
-        return rating
+        return [0] * len(job_descriptions)
         
-    rating = rate_text(plavras, job_description)
+    ratings = rate_texts_batch(plavras, job_descriptions)
 
-    return round(rating)
+    return [round(rating) for rating in ratings]
 
 
    
@@ -338,35 +592,45 @@ def create_time_param(time):
         time (str): A string representing a time period (e.g., "past 24 hours", "past week", "past month", or "any time").
     
     Returns:
-        str: A LinkedIn time parameter string.
+        str: A LinkedIn time parameter string, empty for "any time" or an unknown time period.
   """
   
-  if time == "past 24 hours":
-    TPeriod = "&f_TPR=r86400"
-  
-  elif time == "past week":
-    TPeriod = "&f_TPR=r604800";
-  
-  elif time== "past month":
-    TPeriod = "&f_TPR=r2592000";
+  return _TIME_PARAMS.get(time, "")
+
+def create_search_urls(titles, location, time_param):
+  """
+    Builds a LinkedIn job search URL for each job title.
+    
+    Args:
+        titles (List[str]): The job titles to search for.
+        location (str): The location to search in.
+        time_param (str): A LinkedIn time parameter string, as returned by create_time_param.
+    
+    Returns:
+        List[str]: A LinkedIn job search URL per title.
+  """
+
+  urls = []
   
-  elif time == "any time":
-      TPeriod = ""
-      
-  return TPeriod
+  for title in titles:
+    # Percent-encode every reserved or non-ASCII character of the title and location
+    query = urlencode({"keywords": title, "location": location}, quote_via=quote)
+    urls.append(f"https://www.linkedin.com/jobs/search?{query}{time_param}&position=1&pageNum=0")
 
-# Define a GET endpoint that takes a query parameter 'url' and returns the result of extractJobs function
+  return urls
+
+# Define a GET endpoint that takes a query parameter 'url' and returns the result of extract_jobs_async function
 @app.post("/jobs")
-def get_jobs(user_params: JobsParams):
+async def get_jobs(user_params: JobsParams) -> Tuple[List[dict], int]:
   """
     FastAPI endpoint that accepts a JobsParams object containing user search parameters.
-    Returns the result of the extractJobs function as a JSON response.
+    Returns the result of the extract_jobs_async function as a JSON response.
     
     Args:
         user_params (JobsParams): A Pydantic model containing user search parameters.
     
     Returns:
-        fastapi.responses.JSONResponse: A JSON response containing a list of job dictionaries and the total number of cards.
+        Tuple[List[dict], int]: A list of job dictionaries and the total number of cards. The return type lets FastAPI serialize them straight to JSON with Pydantic.
   """
 
   titles = user_params.titles
@@ -378,15 +642,9 @@ def get_jobs(user_params: JobsParams):
     
 #  user = search_customer(id) # using woocommerce
 
-  location = location.replace(" ", "%20").replace(",", "%2C")
-
-  urls = []
-  
-  for url in titles:
-    keywords = url.replace(" ", "%20").replace(",", "%2C")
-    urls.append(f"https://www.linkedin.com/jobs/search?keywords={keywords}&location={location}{time_period}&position=1&pageNum=0")
+  urls = create_search_urls(titles, location, time_period)
 
-  return JSONResponse(content=extractJobs(urls, plavra))
+  return await extract_jobs_async(app.state.client, app.state.limiter, urls, plavra)
 
 
   
@@ -397,12 +655,8 @@ def main(user_params: JobsParams):
     location = user_params.location
 
     time_period = create_time_param(time_period)
-    location = location.replace(" ", "%20").replace(",", "%2C")
 
-    urls = []
-    for url in titles:
-        keywords = url.replace(" ", "%20").replace(",", "%2C")
-        urls.append(f"https://www.linkedin.com/jobs/search?keywords={keywords}&location={location}{time_period}&position=1&pageNum=0")
+    urls = create_search_urls(titles, location, time_period)
 
     return extractJobs(urls, plavra)
 
@@ -410,9 +664,9 @@ if __name__ == "__main__":
     # Get the JSON string from the command line argument
     json_params = sys.argv[1]
     # Parse the JSON string into a JobsParams object
-    user_params = JobsParams.parse_raw(json_params)
+    user_params = JobsParams.model_validate_json(json_params)
     # Call the main function with the parsed parameters
     result = main(user_params)
-    # Convert the result to a JSON string and print it
-    print(json.dumps(result))
+    # Convert the result to JSON and write it to stdout
+    sys.stdout.buffer.write(orjson.dumps(result) + b"\n")
   
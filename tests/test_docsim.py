@@ -0,0 +1,45 @@
+import pytest
+
+from docsim import rate_text
+from docsim2 import rate_text as docsim2_rate_text, rate_texts_batch
+
+
+TEXTS = [
+    "Python developer wanted. We use python, Django and PYTHON tooling.",
+    "Engenharia Ambiental: gestão de resíduos, licenciamento e Gestão ambiental.",
+    "São Paulo, SÃO PAULO e são josé dos campos",
+    "",
+]
+
+
+@pytest.mark.parametrize("plavra", [
+    ["Python", "django"],
+    ["GESTÃO", "Ambiental"],
+    ["são", "Paulo"],
+    frozenset({"Python", "Gestão"}),
+])
+def test_rate_texts_batch_matches_rate_text(plavra):
+    expected = [rate_text(plavra, text) for text in TEXTS]
+
+    assert rate_texts_batch(plavra, TEXTS) == pytest.approx(expected)
+
+
+def test_rate_texts_batch_without_plavra_or_texts():
+    assert rate_texts_batch([], TEXTS) == [0.0] * len(TEXTS)
+    assert rate_texts_batch(["python"], []) == []
+
+
+def test_rate_text_without_plavra():
+    assert docsim2_rate_text([], "python developer") == 0.0
+
+
+@pytest.mark.parametrize("plavra, expected", [
+    (["machine learning"], 0.0),
+    (["machine learning", "rocks"], 5 / 3),
+])
+def test_phrases_never_match(plavra, expected):
+    text = "machine learning rocks"
+
+    assert rate_text(plavra, text) == pytest.approx(expected)
+    assert docsim2_rate_text(plavra, text) == pytest.approx(expected)
+    assert rate_texts_batch(plavra, [text]) == pytest.approx([expected])
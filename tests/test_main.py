@@ -0,0 +1,23 @@
+import pytest
+
+from main import create_search_urls, create_time_param
+
+
+@pytest.mark.parametrize("time, param", [
+    ("past 24 hours", "&f_TPR=r86400"),
+    ("past week", "&f_TPR=r604800"),
+    ("past month", "&f_TPR=r2592000"),
+    ("any time", ""),
+    ("last century", ""),
+])
+def test_create_time_param(time, param):
+    assert create_time_param(time) == param
+
+
+def test_create_search_urls_encodes_titles_and_location():
+    urls = create_search_urls(["Engenharia Ambiental", "C++ developer"], "São Paulo, Brazil", "&f_TPR=r604800")
+
+    assert urls == [
+        "https://www.linkedin.com/jobs/search?keywords=Engenharia%20Ambiental&location=S%C3%A3o%20Paulo%2C%20Brazil&f_TPR=r604800&position=1&pageNum=0",
+        "https://www.linkedin.com/jobs/search?keywords=C%2B%2B%20developer&location=S%C3%A3o%20Paulo%2C%20Brazil&f_TPR=r604800&position=1&pageNum=0",
+    ]
@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+import diskcache
+import httpx
+import pytest
+
+import main
+
+
+CARD = '<li><h3 class="base-search-card__title">{title}</h3><a href="{url}">{title}</a></li>'
+DESCRIPTION = '<div class="show-more-less-html__markup">{}</div>'
+
+
+def search_page(*jobs):
+    return '<ul class="jobs-search__results-list">' + "".join(CARD.format(title=title, url=url) for title, url in jobs) + "</ul>"
+
+
+def run(handler, fetch):
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch(client, main.RateLimiter())
+
+    return asyncio.run(go())
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch, tmp_path):
+    cache = diskcache.Cache(str(tmp_path))
+    monkeypatch.setattr(main, "DESCRIPTION_CACHE", cache)
+    monkeypatch.setattr(main, "REQUEST_INTERVAL", 0)
+    monkeypatch.setattr(main, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(main, "MAX_BACKOFF", 0.01)
+    yield
+    cache.close()
+
+
+def test_fetch_page_retries_retryable_statuses():
+    statuses = [503, 429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0))
+
+    res = run(handler, lambda client, limiter: main.fetch_page(client, limiter, "https://www.linkedin.com/jobs/search"))
+
+    assert res.status_code == 200
+    assert statuses == []
+
+
+def test_fetch_page_caps_retry_after_and_raises():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    start = time.monotonic()
+    with pytest.raises(httpx.HTTPStatusError):
+        run(handler, lambda client, limiter: main.fetch_page(client, limiter, "https://www.linkedin.com/jobs/search"))
+
+    assert len(requests) == main.MAX_RETRIES + 1
+    assert time.monotonic() - start < 1
+
+
+def test_extract_jobs_skips_failed_pages_and_keeps_url_order():
+    async def handler(request):
+        keywords = request.url.params.get("keywords")
+        if keywords == "slow":
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text=search_page(("Slow job", "https://www.linkedin.com/jobs/view/1")))
+        if keywords == "fast":
+            return httpx.Response(200, text=search_page(("Fast job", "https://www.linkedin.com/jobs/view/2")))
+        if keywords == "broken":
+            return httpx.Response(500)
+        return httpx.Response(200, text=DESCRIPTION.format("python developer"))
+
+    urls = [
+        "https://www.linkedin.com/jobs/search?keywords=slow",
+        "https://www.linkedin.com/jobs/search?keywords=broken",
+        "https://www.linkedin.com/jobs/search?keywords=fast",
+    ]
+    jobs, total_cards = run(handler, lambda client, limiter: main.extract_jobs_async(client, limiter, urls, ["python"]))
+
+    assert [job["jobTitle"] for job in jobs] == ["Slow job", "Fast job"]
+    assert total_cards == 2
+    assert all(job["jobDesc"] == "python developer" for job in jobs)
+
+
+def test_extract_jobs_fetches_each_description_once():
+    description_requests = []
+
+    def handler(request):
+        if request.url.path == "/jobs/search":
+            return httpx.Response(200, text=search_page(("Developer", "https://www.linkedin.com/jobs/view/1")))
+        description_requests.append(request)
+        return httpx.Response(200, text=DESCRIPTION.format("python developer"))
+
+    urls = [
+        "https://www.linkedin.com/jobs/search?keywords=developer",
+        "https://www.linkedin.com/jobs/search?keywords=engineer",
+    ]
+    jobs, _ = run(handler, lambda client, limiter: main.extract_jobs_async(client, limiter, urls, ["python"]))
+
+    assert len(jobs) == 2
+    assert len(description_requests) == 1
+    assert [job["jobDesc"] for job in jobs] == ["python developer"] * 2
+
+
+@pytest.mark.parametrize("path, job_id", [
+    ("/jobs/view/3712345678", "3712345678"),
+    ("/jobs/view/python-developer-at-acme-3712345678/", "3712345678"),
+    ("/jobs/view/python-developer", None),
+])
+def test_job_id_re(path, job_id):
+    match = main.JOB_ID_RE.search(path)
+
+    assert (match.group(1) if match else None) == job_id
+
+
+def test_description_cache_is_keyed_by_job_id():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=DESCRIPTION.format("python developer"))
+
+    async def fetch(client, limiter):
+        return [
+            await main.extractDescription(client, limiter, "https://br.linkedin.com/jobs/view/python-developer-3712345678?trk=public_jobs"),
+            await main.extractDescription(client, limiter, "https://www.linkedin.com/jobs/view/3712345678/"),
+        ]
+
+    assert run(handler, fetch) == [{"description": "python developer"}] * 2
+    assert len(requests) == 1
+
+
+def test_error_pages_and_missing_descriptions_are_not_cached(monkeypatch):
+    responses = [
+        httpx.Response(429),
+        httpx.Response(200, text="<html></html>"),
+        httpx.Response(200, text=DESCRIPTION.format("python developer")),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    async def fetch(client, limiter):
+        url = "https://www.linkedin.com/jobs/view/3712345678"
+        return [await main.extractDescription(client, limiter, url) for _ in range(4)]
+
+    # Without retries the 429 is the final answer for the first fetch
+    monkeypatch.setattr(main, "MAX_RETRIES", 0)
+    results = run(handler, fetch)
+
+    assert results == [
+        {},
+        {"description": "no description specified"},
+        {"description": "python developer"},
+        {"description": "python developer"},
+    ]
+    assert responses == []